@@ -0,0 +1,244 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import aiohttp
+import orjson
+
+from .client import RETRY_STATUSES, BaseClient, JSONType
+from .enums import AttributionSource, PaymentMode, Platform, PromotionDuration
+from .errors import RevenueCatError, Unavailable
+from .response import Offerings, Subscriber, SubscriberAttribute
+from .utils import retry_after
+
+
+class AsyncClient(BaseClient):
+    def __init__(
+        self,
+        public_key: str = None,
+        secret_key: str = None,
+        cache_maxsize: int = 4096,
+        cache_ttl: float = 30.0,
+        max_concurrency: int = 64,
+        max_retries: int = 3,
+        backoff_factor: float = 0.2,
+        backoff_max: float = 10.0,
+    ):
+        super().__init__(public_key, secret_key, cache_maxsize, cache_ttl)
+
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.max_concurrency,
+            ttl_dns_cache=300,
+        )
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+        return None
+
+    async def make_request(
+        self, method, path, payload=None, platform=None, key=None, timeout=5
+    ) -> JSONType:
+        url, headers, data = self._build_request(method, path, payload, platform, key)
+
+        if self.session is None:
+            self.session = self.create_session()
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        attempt = 0
+
+        while True:
+            async with self.semaphore:
+                try:
+                    async with self.session.request(
+                        method, url, headers=headers, data=data, timeout=client_timeout
+                    ) as response:
+                        delay = None
+
+                        if (
+                            response.status in RETRY_STATUSES
+                            and attempt < self.max_retries
+                        ):
+                            delay = retry_after(
+                                response.headers.get("Retry-After"),
+                                self.backoff_factor * (2 ** attempt),
+                                self.backoff_max,
+                            )
+
+                        if delay is None:
+                            response.raise_for_status()
+
+                            return orjson.loads(await response.read())
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    raise Unavailable() from e
+                except aiohttp.ClientError as e:
+                    raise RevenueCatError() from e
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _call(
+        self,
+        endpoint: str,
+        app_user_id: str,
+        payload: JSONType = None,
+        platform: Platform = None,
+        **params: str,
+    ) -> Any:
+        spec, path, key, platform = self._resolve(
+            endpoint, app_user_id, platform, params
+        )
+        result, stamp = self._lookup(spec, app_user_id)
+
+        if result is not None:
+            return result
+
+        data = await self.make_request(spec.method, path, payload, platform, key)
+
+        return self._finish(spec, app_user_id, data, stamp)
+
+    async def get_subscriber_info(self, app_user_id: str) -> Subscriber:
+        return await self._call("get_subscriber_info", app_user_id)
+
+    async def is_user_subscribed(self, app_user_id: str) -> bool:
+        return self.has_active_subscription(await self.get_subscriber_info(app_user_id))
+
+    async def update_subscriber_attrs(
+        self, app_user_id: str, attrs: Dict[str, SubscriberAttribute]
+    ) -> None:
+        payload = self._attrs_payload(attrs)
+
+        return await self._call("update_subscriber_attrs", app_user_id, payload)
+
+    async def delete_subscriber(self, app_user_id: str) -> str:
+        return await self._call("delete_subscriber", app_user_id)
+
+    async def create_purchase(
+        self,
+        app_user_id: str,
+        platform: Platform,
+        fetch_token: str,
+        product_id: str = None,
+        price: float = None,
+        currency: str = None,
+        payment_mode: PaymentMode = None,
+        introductory_price: float = None,
+        is_restore: bool = False,
+        presented_offering_identifier: str = None,
+        attributes: Dict[str, SubscriberAttribute] = None,
+    ) -> Subscriber:
+        payload = self._purchase_payload(
+            app_user_id,
+            fetch_token,
+            product_id,
+            price,
+            currency,
+            payment_mode,
+            introductory_price,
+            is_restore,
+            presented_offering_identifier,
+            attributes,
+        )
+
+        return await self._call("create_purchase", app_user_id, payload, platform)
+
+    async def grant_promotional_entitlement(
+        self,
+        app_user_id: str,
+        entitlement_identifier: str,
+        duration: PromotionDuration,
+        start_time: datetime,
+    ) -> Subscriber:
+        payload = self._grant_payload(duration, start_time)
+
+        return await self._call(
+            "grant_promotional_entitlement",
+            app_user_id,
+            payload,
+            entitlement=entitlement_identifier,
+        )
+
+    async def revoke_promotinal_entitlements(
+        self, app_user_id: str, entitlement_identifier: str
+    ) -> Subscriber:
+        return await self._call(
+            "revoke_promotinal_entitlements",
+            app_user_id,
+            entitlement=entitlement_identifier,
+        )
+
+    async def revoke_google_subscription(
+        self, app_user_id: str, product_identifier: str
+    ) -> Subscriber:
+        return await self._call(
+            "revoke_google_subscription", app_user_id, product=product_identifier
+        )
+
+    async def defer_google_subscription(
+        self, app_user_id: str, product_identifier: str, expiry_time: datetime
+    ) -> Subscriber:
+        payload = self._defer_payload(expiry_time)
+
+        return await self._call(
+            "defer_google_subscription",
+            app_user_id,
+            payload,
+            product=product_identifier,
+        )
+
+    async def refund_google_subscription(
+        self, app_user_id: str, product_identifier: str
+    ) -> Subscriber:
+        # store_transaction_identifier
+        return await self._call(
+            "refund_google_subscription", app_user_id, product=product_identifier
+        )
+
+    async def add_user_attribution(
+        self,
+        app_user_id: str,
+        network: AttributionSource,
+        rc_idfa: str = None,
+        rc_gps_adid: str = None,
+    ) -> None:
+        return await self._call("add_user_attribution", app_user_id)
+
+    async def get_offerings(self, app_user_id: str, platform: Platform) -> Offerings:
+        return await self._call("get_offerings", app_user_id, platform=platform)
+
+    async def override_current_offering(
+        self, app_user_id: str, offering_uuid: str
+    ) -> Subscriber:
+        return await self._call(
+            "override_current_offering", app_user_id, offering=offering_uuid
+        )
+
+    async def delete_current_offering_override(self, app_user_id: str) -> Subscriber:
+        return await self._call("delete_current_offering_override", app_user_id)
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # generation of the latest pop per key, so a read that started before
+        # an invalidation can't store what it fetched afterwards
+        self._generation = 0
+        self._popped = OrderedDict()
+        self._popped_floor = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                return default
+
+            expiry, value = entry
+
+            if expiry < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+
+            return value
+
+    def stamp(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, stamp: Optional[int] = None) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return None
+
+        with self._lock:
+            if stamp is not None and (
+                self._popped.get(key, 0) > stamp or self._popped_floor > stamp
+            ):
+                return None
+
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return None
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self._popped[key] = self._generation
+            self._popped.move_to_end(key)
+
+            while len(self._popped) > max(self.maxsize, 1):
+                _, generation = self._popped.popitem(last=False)
+                self._popped_floor = generation
+
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self._popped.clear()
+            self._popped_floor = self._generation
+
+        return None
@@ -1,55 +1,267 @@
-import json
+import time
 from datetime import datetime
+from enum import Enum
 from http.cookiejar import CookiePolicy
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
+import orjson
 import requests
-
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import (
+    HTTPError,
+    MaxRetryError,
+    ProtocolError,
+    ReadTimeoutError,
+    ResponseError,
+)
+from urllib3.util.retry import Retry
+
+from .cache import TTLCache
 from .enums import AttributionSource, PaymentMode, Platform, PromotionDuration
 from .errors import RevenueCatError, Unavailable
-from .response import Offering, Offerings, Package, Subscriber, SubscriberAttribute
-from .utils import encode, to_timestamp
+from .response import (
+    Offerings,
+    Subscriber,
+    SubscriberAttribute,
+    build_offerings,
+    build_subscriber,
+)
+from .utils import encode, enum_value, parse_timestamp, to_timestamp
 
 JSONType = Union[str, int, float, bool, None, Dict[str, Any], List[Any]]
 
+_ANY_KEY = "any"
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def _parse_subscriber(data: JSONType) -> Subscriber:
+    return build_subscriber(data["subscriber"])
+
+
+def _parse_app_user_id(data: JSONType) -> str:
+    return data["app_user_id"]
+
+
+def _parse_nothing(data: JSONType) -> None:
+    return None
+
+
+class _Endpoint(NamedTuple):
+    method: str
+    path: str
+    key: str
+    parse: Callable[[JSONType], Any]
+    mutates: bool = False
+    cached: bool = False
+
+
+_SUBSCRIBER = "/subscribers/{uid}"
+_ENDPOINTS = {
+    "get_subscriber_info": _Endpoint(
+        "GET", _SUBSCRIBER, _ANY_KEY, _parse_subscriber, cached=True
+    ),
+    "update_subscriber_attrs": _Endpoint(
+        "POST", _SUBSCRIBER + "/attributes", "public", _parse_nothing, True
+    ),
+    "delete_subscriber": _Endpoint(
+        "DELETE", _SUBSCRIBER, "secret", _parse_app_user_id, True
+    ),
+    "create_purchase": _Endpoint(
+        "POST", "/receipts", "public", _parse_subscriber, True
+    ),
+    "grant_promotional_entitlement": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/entitlements/{entitlement}/promotional",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "revoke_promotinal_entitlements": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/entitlements/{entitlement}/revoke_promotionals",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "revoke_google_subscription": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/subscriptions/{product}/revoke",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "defer_google_subscription": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/subscriptions/{product}/defer",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "refund_google_subscription": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/subscriptions/{product}/refund",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "add_user_attribution": _Endpoint(
+        "POST", _SUBSCRIBER + "/attribution", "public", _parse_nothing, True
+    ),
+    "get_offerings": _Endpoint(
+        "GET", _SUBSCRIBER + "/offerings", "public", build_offerings
+    ),
+    "override_current_offering": _Endpoint(
+        "POST",
+        _SUBSCRIBER + "/offerings/{offering}/override",
+        "secret",
+        _parse_subscriber,
+        True,
+    ),
+    "delete_current_offering_override": _Endpoint(
+        "DELETE", _SUBSCRIBER + "/offerings/override", "secret", _parse_subscriber, True
+    ),
+}
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Enum):
+        return obj.value
+
+    raise TypeError
+
 
 class BlockAll(CookiePolicy):
+    netscape = True
+    rfc2965 = hide_cookie2 = False
+
     def set_ok(self, cookie, request):
         return False
 
+    def return_ok(self, cookie, request):
+        return False
+
+    def domain_return_ok(self, domain, request):
+        return False
+
+    def path_return_ok(self, path, request):
+        return False
+
+
+class _CappedRetry(Retry):
+    # give up instead of sleeping when Retry-After asks for more than this
+    retry_after_limit = 10.0
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.retry_after_limit = self.retry_after_limit
+
+        return retry
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        if response is not None and self.respect_retry_after_header:
+            retry_after = self.get_retry_after(response)
+
+            if retry_after is not None and retry_after > self.retry_after_limit:
+                raise MaxRetryError(
+                    _pool, url, ResponseError("Retry-After exceeds the limit")
+                )
+
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+_NO_COOKIES = BlockAll()
+_SHARED_SESSIONS: Dict[float, requests.Session] = {}
+
+
+def _create_session(backoff_max: float) -> requests.Session:
+    session = requests.Session()
+    session.trust_env = False
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+    )
+    session.cookies.set_policy(_NO_COOKIES)
+
+    retry = _CappedRetry(
+        total=5,
+        read=False,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(("GET", "POST", "DELETE")),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    retry.retry_after_limit = backoff_max
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
 
-class Client:
+
+def _get_session(backoff_max: float) -> requests.Session:
+    session = _SHARED_SESSIONS.get(backoff_max)
+
+    if session is None:
+        session = _create_session(backoff_max)
+        _SHARED_SESSIONS[backoff_max] = session
+
+    return session
+
+
+class BaseClient:
     base_api_url = "https://api.revenuecat.com/v1"
 
-    def __init__(self, public_key: str = None, secret_key: str = None):
+    def __init__(
+        self,
+        public_key: str = None,
+        secret_key: str = None,
+        cache_maxsize: int = 4096,
+        cache_ttl: float = 30.0,
+    ):
         if public_key is None and secret_key is None:
             raise Exception("Either public key or secret key must be set")
 
-        self.session = self.create_session()
         self.public_key = public_key
         self.secret_key = secret_key
+        self.subscriber_cache = TTLCache(cache_maxsize, cache_ttl)
+        self.headers_cache: Dict[Tuple[Optional[str], Any], Dict[str, str]] = {}
 
-    def create_session(self):
-        session = requests.Session()
-        session.headers.update(
-            {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            }
-        )
-        session.cookies.policy = BlockAll()
+    def invalidate(self, app_user_id: str) -> None:
+        self.subscriber_cache.pop(app_user_id)
+
+        return None
 
-        return session
+    def _build_request(
+        self, method, path, payload=None, platform=None, key=None
+    ) -> Tuple[str, Dict[str, str], Optional[bytes]]:
+        url = self.base_api_url + path
+        # keep the body as bytes so the HTTP libraries send it without re-encoding
+        data = orjson.dumps(payload, default=_default) if payload is not None else None
+        headers = self.headers_cache.get((key, platform))
 
-    def make_request(
-        self, method, path, payload=None, platform=None, key=None, timeout=5
-    ) -> JSONType:
-        url = self.base_api_url + encode(path)
-        data = json.dumps(payload) if payload is not None else None
+        if headers is None:
+            headers = self._build_headers(platform, key)
+            self.headers_cache[key, platform] = headers
+
+        return url, headers, data
+
+    def _build_headers(self, platform=None, key=None) -> Dict[str, str]:
         headers = {}
 
         if platform is not None:
-            headers.update({"X-Platform": platform})
+            headers["X-Platform"] = platform
 
         if key is not None:
             token = self.public_key if key == "public" else self.secret_key
@@ -57,77 +269,150 @@ class Client:
             if token is None:
                 raise Exception(f"This functionality requires {key} key to be set")
 
-            headers.update({"Authorization": f"Bearer {token}"})
+            headers["Authorization"] = f"Bearer {token}"
 
-        try:
-            response = self.session.request(
-                method=method, url=url, headers=headers, data=data, timeout=timeout
-            )
-            response.raise_for_status()
-        except (requests.ConnectionError, requests.Timeout) as e:
-            raise Unavailable() from e
-        except Exception as e:
-            raise RevenueCatError() from e
+        return headers
+
+    def _resolve(
+        self,
+        endpoint: str,
+        app_user_id: str,
+        platform: Optional[Platform],
+        params: Dict[str, str],
+    ) -> Tuple[_Endpoint, str, str, Optional[str]]:
+        spec = _ENDPOINTS[endpoint]
+        path = spec.path.format(
+            uid=encode(app_user_id), **{k: encode(v) for k, v in params.items()}
+        )
+        key = spec.key
+
+        if key == _ANY_KEY:
+            key = "secret" if self.secret_key else "public"
+
+        return spec, path, key, enum_value(platform)
 
-        return response.json()
+    def _lookup(self, spec: _Endpoint, app_user_id: str) -> Tuple[Any, int]:
+        if not spec.cached:
+            return None, 0
+
+        cache = self.subscriber_cache
+        stamp = cache.stamp()
+
+        return cache.get(app_user_id), stamp
+
+    def _finish(
+        self, spec: _Endpoint, app_user_id: str, data: JSONType, stamp: int
+    ) -> Any:
+        if spec.mutates:
+            self.invalidate(app_user_id)
+
+        result = spec.parse(data)
+
+        if spec.cached:
+            self.subscriber_cache.set(app_user_id, result, stamp)
+
+        return result
+
+    @staticmethod
+    def _attrs_payload(attrs: Dict[str, SubscriberAttribute]) -> JSONType:
+        return {"attributes": attrs}
+
+    @staticmethod
+    def _purchase_payload(
+        app_user_id: str,
+        fetch_token: str,
+        product_id: Optional[str],
+        price: Optional[float],
+        currency: Optional[str],
+        payment_mode: Optional[PaymentMode],
+        introductory_price: Optional[float],
+        is_restore: bool,
+        presented_offering_identifier: Optional[str],
+        attributes: Optional[Dict[str, SubscriberAttribute]],
+    ) -> JSONType:
+        return {
+            "app_user_id": app_user_id,
+            "fetch_token": fetch_token,
+            "product_id": product_id,
+            "price": price,
+            "currency": currency,
+            "payment_mode": enum_value(payment_mode),
+            "introductory_price": introductory_price,
+            "is_restore": str(is_restore).lower(),
+            "presented_offering_identifier": presented_offering_identifier,
+            "attributes": attributes,
+        }
+
+    @staticmethod
+    def _grant_payload(duration: PromotionDuration, start_time: datetime) -> JSONType:
+        return {
+            "duration": enum_value(duration),
+            "start_time_ms": to_timestamp(start_time),
+        }
+
+    @staticmethod
+    def _defer_payload(expiry_time: datetime) -> JSONType:
+        return {"expiry_time_ms": to_timestamp(expiry_time)}
 
     @staticmethod
     def generate_subscriber_response(data: JSONType) -> Subscriber:
-        return Subscriber(**data)
+        return build_subscriber(data)
 
     @staticmethod
     def generate_offerings_response(data: JSONType) -> Offerings:
-        offerings = []
+        return build_offerings(data)
 
-        for o in data["offerings"]:
-            packages = []
+    @staticmethod
+    def has_active_subscription(info: Subscriber) -> bool:
+        now = time.time()
 
-            for p in data["offerings"]["packages"]:
-                packages.append(Package(**p))
+        for subscription in info.subscriptions.values():
+            expires_date = subscription.expires_date
 
-            offerings.append(Offering(**o, packages=packages))
+            if expires_date is None or parse_timestamp(expires_date) >= now:
+                return True
 
-        return Offerings(
-            current_offering_id=data["current_offering_id"], offerings=offerings
-        )
+        return False
 
-    def get_subscriber_info(self, app_user_id: str) -> Subscriber:
-        path = f"/subscribers/{app_user_id}"
-        key = "secret" if self.secret_key else "public"
 
-        data = self.make_request("GET", path, key=key)
+class SyncClientMixin:
+    # public API shared by the blocking clients; they provide make_request
 
-        return self.generate_subscriber_response(data["subscriber"])
+    def _call(
+        self,
+        endpoint: str,
+        app_user_id: str,
+        payload: JSONType = None,
+        platform: Platform = None,
+        **params: str,
+    ) -> Any:
+        spec, path, key, platform = self._resolve(
+            endpoint, app_user_id, platform, params
+        )
+        result, stamp = self._lookup(spec, app_user_id)
 
-    def is_user_subscribed(self, app_user_id: str) -> bool:
-        info = self.get_subscriber_info(app_user_id)
-        is_subscribed = False
+        if result is not None:
+            return result
 
-        if info.subscriptions:
-            expires_date = datetime.strptime(
-                next(iter(info.subscriptions)).expires_date, "%Y-%m-%dT%H:%M:%SZ"
-            )
-            if expires_date >= datetime.now():
-                is_subscribed = True
+        data = self.make_request(spec.method, path, payload, platform, key)
 
-        return is_subscribed
+        return self._finish(spec, app_user_id, data, stamp)
+
+    def get_subscriber_info(self, app_user_id: str) -> Subscriber:
+        return self._call("get_subscriber_info", app_user_id)
+
+    def is_user_subscribed(self, app_user_id: str) -> bool:
+        return self.has_active_subscription(self.get_subscriber_info(app_user_id))
 
     def update_subscriber_attrs(
         self, app_user_id: str, attrs: Dict[str, SubscriberAttribute]
     ) -> None:
-        path = f"/subscribers/{app_user_id}/attributes"
-        payload = {"attributes": attrs}
+        payload = self._attrs_payload(attrs)
 
-        self.make_request("POST", path, payload, key="public")  # check key
-
-        return None
+        return self._call("update_subscriber_attrs", app_user_id, payload)
 
     def delete_subscriber(self, app_user_id: str) -> str:
-        path = f"/subscribers/{app_user_id}"
-
-        data = self.make_request("DELETE", path, key="secret")
-
-        return data["app_user_id"]
+        return self._call("delete_subscriber", app_user_id)
 
     def create_purchase(
         self,
@@ -143,25 +428,20 @@ class Client:
         presented_offering_identifier: str = None,
         attributes: Dict[str, SubscriberAttribute] = None,
     ) -> Subscriber:
-        path = "/receipts"
-        payload = {
-            "app_user_id": app_user_id,
-            "fetch_token": fetch_token,
-            "product_id": product_id,
-            "price": price,
-            "currency": currency,
-            "payment_mode": payment_mode,
-            "introductory_price": introductory_price,
-            "is_restore": str(is_restore).lower(),
-            "presented_offering_identifier": presented_offering_identifier,
-            "attributes": attributes,
-        }
-
-        data = self.make_request(
-            "POST", path, payload=payload, platform=platform, key="public"
+        payload = self._purchase_payload(
+            app_user_id,
+            fetch_token,
+            product_id,
+            price,
+            currency,
+            payment_mode,
+            introductory_price,
+            is_restore,
+            presented_offering_identifier,
+            attributes,
         )
 
-        return self.generate_subscriber_response(data)
+        return self._call("create_purchase", app_user_id, payload, platform)
 
     def grant_promotional_entitlement(
         self,
@@ -170,56 +450,50 @@ class Client:
         duration: PromotionDuration,
         start_time: datetime,
     ) -> Subscriber:
-        path = f"""
-        /subscribers/{app_user_id}/entitlements/{entitlement_identifier}/promotional
-        """
-        start_time_ms = to_timestamp(start_time)
-        payload = {"duration": duration, "start_time_ms": start_time_ms}
-
-        data = self.make_request("POST", path, payload=payload, key="secret")
+        payload = self._grant_payload(duration, start_time)
 
-        return self.generate_subscriber_response(data)
+        return self._call(
+            "grant_promotional_entitlement",
+            app_user_id,
+            payload,
+            entitlement=entitlement_identifier,
+        )
 
     def revoke_promotinal_entitlements(
         self, app_user_id: str, entitlement_identifier: str
     ) -> Subscriber:
-        path = f"""
-        /subscribers/{app_user_id}/entitlements/{entitlement_identifier}/revoke_promotionals
-        """
-
-        data = self.make_request("POST", path, key="secret")
-
-        return self.generate_subscriber_response(data)
+        return self._call(
+            "revoke_promotinal_entitlements",
+            app_user_id,
+            entitlement=entitlement_identifier,
+        )
 
     def revoke_google_subscription(
         self, app_user_id: str, product_identifier: str
     ) -> Subscriber:
-        path = f"/subscribers/{app_user_id}/subscriptions/{product_identifier}/revoke"
-
-        data = self.make_request("POST", path, key="secret")
-
-        return self.generate_subscriber_response(data)
+        return self._call(
+            "revoke_google_subscription", app_user_id, product=product_identifier
+        )
 
     def defer_google_subscription(
         self, app_user_id: str, product_identifier: str, expiry_time: datetime
     ) -> Subscriber:
-        path = f"/subscribers/{app_user_id}/subscriptions/{product_identifier}/defer"
-        expiry_time_ms = to_timestamp(expiry_time)
-        payload = {"expiry_time_ms": expiry_time_ms}
-
-        data = self.make_request("POST", path, payload, key="secret")
+        payload = self._defer_payload(expiry_time)
 
-        return self.generate_subscriber_response(data)
+        return self._call(
+            "defer_google_subscription",
+            app_user_id,
+            payload,
+            product=product_identifier,
+        )
 
     def refund_google_subscription(
         self, app_user_id: str, product_identifier: str
     ) -> Subscriber:
         # store_transaction_identifier
-        path = f"/subscribers/{app_user_id}/subscriptions/{product_identifier}/refund"
-
-        data = self.make_request("POST", path, key="secret")
-
-        return self.generate_subscriber_response(data)
+        return self._call(
+            "refund_google_subscription", app_user_id, product=product_identifier
+        )
 
     def add_user_attribution(
         self,
@@ -228,31 +502,66 @@ class Client:
         rc_idfa: str = None,
         rc_gps_adid: str = None,
     ) -> None:
-        path = f"/subscribers/{app_user_id}/attribution"
-
-        self.make_request("POST", path, key="public")  # check key
-
-        return None
+        return self._call("add_user_attribution", app_user_id)
 
     def get_offerings(self, app_user_id: str, platform: Platform) -> Offerings:
-        path = f"/subscribers/{app_user_id}/offerings"
-
-        data = self.make_request("GET", path, platform=platform, key="public")
-
-        return self.get_offerings_response(data)
+        return self._call("get_offerings", app_user_id, platform=platform)
 
     def override_current_offering(
         self, app_user_id: str, offering_uuid: str
     ) -> Subscriber:
-        path = f"/subscribers/{app_user_id}/offerings/{offering_uuid}/override"
+        return self._call(
+            "override_current_offering", app_user_id, offering=offering_uuid
+        )
 
-        data = self.make_request("POST", path, key="secret")
+    def delete_current_offering_override(self, app_user_id: str) -> Subscriber:
+        return self._call("delete_current_offering_override", app_user_id)
 
-        return self.generate_subscriber_response(data)
 
-    def delete_current_offering_override(self, app_user_id: str) -> Subscriber:
-        path = f"/subscribers/{app_user_id}/offerings/override"
+class Client(SyncClientMixin, BaseClient):
+    def __init__(
+        self,
+        public_key: str = None,
+        secret_key: str = None,
+        cache_maxsize: int = 4096,
+        cache_ttl: float = 30.0,
+        backoff_max: float = 10.0,
+    ):
+        super().__init__(public_key, secret_key, cache_maxsize, cache_ttl)
+
+        # shared by every Client in the process with the same backoff_max,
+        # changes to it affect all of them
+        self.session = _get_session(backoff_max)
+        self._prepare = self.session.prepare_request
+        self._send = self.session.send
+
+    def make_request(
+        self, method, path, payload=None, platform=None, key=None, timeout=5
+    ) -> JSONType:
+        url, headers, data = self._build_request(method, path, payload, platform, key)
+
+        response = None
 
-        data = self.make_request("DELETE", path, key="secret")
+        try:
+            request = self._prepare(
+                requests.Request(method, url, headers=headers, data=data)
+            )
+            response = self._send(
+                request, timeout=timeout, allow_redirects=False, stream=True
+            )
+            response.raise_for_status()
+            body = response.raw.read(decode_content=True)
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            ProtocolError,
+            ReadTimeoutError,
+        ) as e:
+            raise Unavailable() from e
+        except (requests.RequestException, HTTPError) as e:
+            raise RevenueCatError() from e
+        finally:
+            if response is not None:
+                response.close()
 
-        return self.generate_subscriber_response(data)
+        return orjson.loads(body)
@@ -51,3 +51,8 @@ class Store(Enum):
 class OwnershipType(Enum):
     PURCHASED = "PURCHASED"
     FAMILY_SHARED = "FAMILY_SHARED"
+
+
+PERIOD_TYPE_BY_VALUE = PeriodType._value2member_map_
+STORE_BY_VALUE = Store._value2member_map_
+OWNERSHIP_TYPE_BY_VALUE = OwnershipType._value2member_map_
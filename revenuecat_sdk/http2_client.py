@@ -0,0 +1,97 @@
+import time
+from http.cookiejar import CookieJar
+from typing import Optional
+
+import httpx
+import orjson
+
+from .client import RETRY_STATUSES, BaseClient, BlockAll, JSONType, SyncClientMixin
+from .errors import RevenueCatError, Unavailable
+from .utils import retry_after
+
+_SHARED_CLIENT: Optional[httpx.Client] = None
+
+
+def _create_client() -> httpx.Client:
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(5.0),
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        },
+        cookies=CookieJar(policy=BlockAll()),
+        trust_env=False,
+    )
+
+
+def _get_client() -> httpx.Client:
+    global _SHARED_CLIENT
+
+    if _SHARED_CLIENT is None:
+        _SHARED_CLIENT = _create_client()
+
+    return _SHARED_CLIENT
+
+
+class HTTP2Client(SyncClientMixin, BaseClient):
+    def __init__(
+        self,
+        public_key: str = None,
+        secret_key: str = None,
+        cache_maxsize: int = 4096,
+        cache_ttl: float = 30.0,
+        max_retries: int = 5,
+        backoff_factor: float = 0.3,
+        backoff_max: float = 10.0,
+    ):
+        super().__init__(public_key, secret_key, cache_maxsize, cache_ttl)
+
+        self.session = _get_client()
+        self._httpx_build = self.session.build_request
+        self._httpx_send = self.session.send
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+    def make_request(
+        self, method, path, payload=None, platform=None, key=None, timeout=5
+    ) -> JSONType:
+        url, headers, data = self._build_request(method, path, payload, platform, key)
+        attempt = 0
+
+        while True:
+            request = self._httpx_build(
+                method, url, headers=headers, content=data, timeout=timeout
+            )
+
+            try:
+                response = self._httpx_send(request, stream=True)
+
+                try:
+                    delay = None
+
+                    if (
+                        response.status_code in RETRY_STATUSES
+                        and attempt < self.max_retries
+                    ):
+                        delay = retry_after(
+                            response.headers.get("Retry-After"),
+                            self.backoff_factor * (2 ** attempt),
+                            self.backoff_max,
+                        )
+
+                    if delay is None:
+                        response.raise_for_status()
+
+                        return orjson.loads(response.read())
+                finally:
+                    response.close()
+            except httpx.TransportError as e:
+                raise Unavailable() from e
+            except httpx.HTTPError as e:
+                raise RevenueCatError() from e
+
+            attempt += 1
+            time.sleep(delay)
@@ -1,15 +1,39 @@
-from typing import Dict, List, NamedTuple, Optional
+import sys
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Callable, Dict, List, Optional
 
-from .enums import OwnershipType, PeriodType, Store
+from .enums import (
+    OWNERSHIP_TYPE_BY_VALUE,
+    PERIOD_TYPE_BY_VALUE,
+    STORE_BY_VALUE,
+    OwnershipType,
+    PeriodType,
+    Store,
+)
 
+if sys.version_info >= (3, 10):
+    _response = dataclass(frozen=True, slots=True)
+else:
+    _response = dataclass(frozen=True)
 
-class Entitlement(NamedTuple):
+
+class _Response:
+    __slots__ = ()
+
+    @classmethod
+    def _make(cls, iterable):
+        return cls(*iterable)
+
+
+@_response
+class Entitlement(_Response):
     expires_date: str
     purchase_date: str
     product_identifier: str
 
 
-class Subscription(NamedTuple):
+@_response
+class Subscription(_Response):
     expires_date: str
     purchase_date: str
     original_purchase_date: str
@@ -21,19 +45,22 @@ class Subscription(NamedTuple):
     billing_issues_detected_at: str
 
 
-class NonSubscription(NamedTuple):
+@_response
+class NonSubscription(_Response):
     id: str
     purchase_date: str
     store: Store
     is_sandbox: bool
 
 
-class SubscriberAttribute(NamedTuple):
+@_response
+class SubscriberAttribute(_Response):
     value: str
     updated_at_ms: int
 
 
-class Subscriber(NamedTuple):
+@_response
+class Subscriber(_Response):
     original_app_user_id: str
     original_application_version: Optional[str]
     first_seen: str
@@ -43,21 +70,81 @@ class Subscriber(NamedTuple):
     other_purchases: dict
     entitlements: Dict[str, Entitlement]
     subscriptions: Dict[str, Subscription]
-    non_subscriptions: Dict[str, NonSubscription]
+    non_subscriptions: Dict[str, List[NonSubscription]]
     subscriber_attributes: Optional[Dict[str, SubscriberAttribute]] = None
 
 
-class Package(NamedTuple):
+@_response
+class Package(_Response):
     identifier: str
     platform_product_identifier: str
 
 
-class Offering(NamedTuple):
+@_response
+class Offering(_Response):
     description: str
     identifier: str
     packages: List[Package]
 
 
-class Offerings(NamedTuple):
+@_response
+class Offerings(_Response):
     current_offering_id: str
     offerings: List[Offering]
+
+
+def make_builder(cls, **converters: Callable[[Any], Any]) -> Callable[[dict], Any]:
+    # unknown keys are ignored and missing ones fall back to the field default
+    defaults = tuple(
+        (f.name, None if f.default is MISSING else f.default) for f in fields(cls)
+    )
+    converted = tuple(
+        (index, converters[name])
+        for index, (name, _) in enumerate(defaults)
+        if name in converters
+    )
+
+    def build(data: dict):
+        values = [data.get(name, default) for name, default in defaults]
+
+        for index, convert in converted:
+            if values[index] is not None:
+                values[index] = convert(values[index])
+
+        return cls(*values)
+
+    return build
+
+
+def _dict_of(build: Callable[[dict], Any]) -> Callable[[dict], dict]:
+    return lambda data: {k: build(v) for k, v in data.items()}
+
+
+def _list_of(build: Callable[[dict], Any]) -> Callable[[list], list]:
+    return lambda data: [build(v) for v in data]
+
+
+def _enum_of(members: Dict[Any, Any]) -> Callable[[Any], Any]:
+    # values this SDK doesn't know about yet are kept as-is
+    return lambda value: members.get(value, value)
+
+
+build_entitlement = make_builder(Entitlement)
+build_subscription = make_builder(
+    Subscription,
+    ownership_type=_enum_of(OWNERSHIP_TYPE_BY_VALUE),
+    period_type=_enum_of(PERIOD_TYPE_BY_VALUE),
+    store=_enum_of(STORE_BY_VALUE),
+)
+build_non_subscription = make_builder(NonSubscription, store=_enum_of(STORE_BY_VALUE))
+build_subscriber_attribute = make_builder(SubscriberAttribute)
+build_subscriber = make_builder(
+    Subscriber,
+    entitlements=_dict_of(build_entitlement),
+    subscriptions=_dict_of(build_subscription),
+    non_subscriptions=_dict_of(_list_of(build_non_subscription)),
+    subscriber_attributes=_dict_of(build_subscriber_attribute),
+)
+build_package = make_builder(Package)
+build_offering = make_builder(Offering, packages=_list_of(build_package))
+build_offerings = make_builder(Offerings, offerings=_list_of(build_offering))
@@ -1,10 +1,53 @@
-import urllib
+import re
+from calendar import timegm
 from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from urllib.parse import quote
+
+_quote = quote
+_is_safe = re.compile(r"\A[A-Za-z0-9._~\-]{1,256}\Z").match
 
 
 def encode(value: str) -> str:
-    return urllib.parse.quote(value)
+    return value if _is_safe(value) else _quote(value, safe="")
+
+
+def enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def to_timestamp(value: datetime) -> int:
+    # naive values are taken to be UTC
+    return timegm(value.utctimetuple()) * 1000 + value.microsecond // 1000
+
+
+def parse_timestamp(value: str) -> int:
+    # RevenueCat always emits "YYYY-MM-DDTHH:MM:SSZ"
+    return timegm(
+        (
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+        )
+    )
+
 
+def retry_after(
+    value: Optional[str], default: float, maximum: float
+) -> Optional[float]:
+    # None when the server asks for a longer wait than we are willing to block;
+    # non-positive values fall back to the backoff, as urllib3 does
+    if value is not None:
+        try:
+            delay = float(value)
+        except ValueError:
+            pass
+        else:
+            if delay > 0:
+                return delay if delay <= maximum else None
 
-def to_timestamp(value: datetime) -> float:
-    return value.timestamp() * 1000.0
+    return min(default, maximum)
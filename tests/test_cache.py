@@ -0,0 +1,81 @@
+import pytest
+
+from revenuecat_sdk import cache
+from revenuecat_sdk.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+    return now
+
+
+def test_get_returns_value_until_ttl_expires(clock):
+    c = TTLCache(maxsize=10, ttl=30.0)
+    c.set("a", 1)
+
+    clock[0] += 29.0
+    assert c.get("a") == 1
+
+    clock[0] += 2.0
+    assert c.get("a") is None
+
+
+def test_evicts_least_recently_used(clock):
+    c = TTLCache(maxsize=2, ttl=30.0)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+
+    assert c.get("a") == 1
+    assert c.get("b") is None
+    assert c.get("c") == 3
+
+
+def test_zero_ttl_disables_caching(clock):
+    c = TTLCache(maxsize=10, ttl=0)
+    c.set("a", 1)
+
+    assert c.get("a") is None
+
+
+def test_pop_removes_entry(clock):
+    c = TTLCache(maxsize=10, ttl=30.0)
+    c.set("a", 1)
+    c.pop("a")
+
+    assert c.get("a") is None
+
+
+def test_set_skipped_when_key_popped_after_stamp(clock):
+    c = TTLCache(maxsize=10, ttl=30.0)
+    stamp = c.stamp()
+    c.pop("a")
+    c.set("a", "stale", stamp)
+
+    assert c.get("a") is None
+
+    c.set("a", "fresh", c.stamp())
+    assert c.get("a") == "fresh"
+
+
+def test_set_not_blocked_by_other_keys(clock):
+    c = TTLCache(maxsize=10, ttl=30.0)
+    stamp = c.stamp()
+    c.pop("b")
+    c.set("a", 1, stamp)
+
+    assert c.get("a") == 1
+
+
+def test_set_skipped_when_pop_record_was_evicted(clock):
+    c = TTLCache(maxsize=1, ttl=30.0)
+    stamp = c.stamp()
+    c.pop("a")
+    c.pop("b")
+    c.set("a", "stale", stamp)
+
+    assert c.get("a") is None
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from revenuecat_sdk.client import Client
+from revenuecat_sdk.enums import PromotionDuration
+
+SUBSCRIBER = {
+    "original_app_user_id": "u",
+    "first_seen": "2020-01-01T00:00:00Z",
+    "last_seen": "2020-01-01T00:00:00Z",
+    "entitlements": {},
+    "subscriptions": {},
+    "non_subscriptions": {},
+}
+
+
+class FakeClient(Client):
+    def __init__(self):
+        super().__init__(secret_key="secret")
+
+        self.requests = []
+        self.on_request = None
+
+    def make_request(
+        self, method, path, payload=None, platform=None, key=None, timeout=5
+    ):
+        self.requests.append((method, path))
+
+        if self.on_request is not None:
+            on_request, self.on_request = self.on_request, None
+            on_request()
+
+        return {"subscriber": SUBSCRIBER}
+
+
+def test_get_subscriber_info_is_cached():
+    client = FakeClient()
+
+    first = client.get_subscriber_info("u")
+    second = client.get_subscriber_info("u")
+
+    assert first is second
+    assert len(client.requests) == 1
+
+
+def test_mutation_invalidates_cached_subscriber():
+    client = FakeClient()
+    client.get_subscriber_info("u")
+
+    client.grant_promotional_entitlement(
+        "u", "pro", PromotionDuration.WEEKLY, datetime(2020, 1, 1)
+    )
+    client.get_subscriber_info("u")
+
+    assert [method for method, _ in client.requests] == ["GET", "POST", "GET"]
+
+
+def test_read_in_flight_during_invalidation_is_not_cached():
+    client = FakeClient()
+    client.on_request = lambda: client.invalidate("u")
+
+    client.get_subscriber_info("u")
+    client.get_subscriber_info("u")
+
+    assert len(client.requests) == 2
@@ -0,0 +1,20 @@
+from revenuecat_sdk.utils import retry_after
+
+
+def test_retry_after_uses_header_value():
+    assert retry_after("2", 0.3, 10.0) == 2.0
+
+
+def test_retry_after_over_maximum_gives_up():
+    assert retry_after("3600", 0.3, 10.0) is None
+
+
+def test_retry_after_falls_back_to_backoff():
+    assert retry_after(None, 0.6, 10.0) == 0.6
+    assert retry_after("soon", 0.6, 10.0) == 0.6
+    assert retry_after("0", 0.6, 10.0) == 0.6
+    assert retry_after("-5", 0.6, 10.0) == 0.6
+
+
+def test_retry_after_backoff_is_capped():
+    assert retry_after(None, 38.4, 10.0) == 10.0